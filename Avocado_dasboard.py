@@ -19,8 +19,18 @@
 # In[2]:
 
 
+import sys
 import pandas as pd
-import plotly.express as px
+from startup import lazy_import, load_in_background
+
+# plotly.express is imported on first use, i.e. when the first figure is drawn
+px = lazy_import('plotly.express')
+
+# The CSV is read once, in the background, and shared by every step below
+avocado_future = load_in_background(pd.read_csv, 'avocado-updated-2020.csv')
+
+# The exploration steps only run inside Jupyter; as a script the file goes straight to the app
+IN_NOTEBOOK = 'ipykernel' in sys.modules
 
 
 # We’ll use the Avocado Prices dataset to build our example dashboard. So let’s load it and take a look at its summary.
@@ -28,9 +38,10 @@ import plotly.express as px
 # In[3]:
 
 
-df = pd.read_csv('avocado-updated-2020.csv')
+if IN_NOTEBOOK:
+    df = avocado_future.result()
 
-df.info()
+    df.info()
 
 
 # Now suppose we want to present the average prices of different types of avocados for various geographies across time, i.e., we want to focus on presenting the information of the columns date, average_price, type, and geography.
@@ -42,8 +53,9 @@ df.info()
 # In[4]:
 
 
-print(df['type'].value_counts(dropna=False))
-print(df['geography'].value_counts(dropna=False))
+if IN_NOTEBOOK:
+    print(df['type'].value_counts(dropna=False))
+    print(df['geography'].value_counts(dropna=False))
 
 
 # Since there are only two avocados types, we can plot their average_price time series on the same line chart. Let’s try creating such a figure when geography is ‘Los Angeles’.
@@ -51,9 +63,10 @@ print(df['geography'].value_counts(dropna=False))
 # In[5]:
 
 
-msk = df['geography'] == 'Los Angeles'
+if IN_NOTEBOOK:
+    msk = df['geography'] == 'Los Angeles'
 
-px.line(df[msk], x='date', y='average_price', color='type')
+    px.line(df[msk], x='date', y='average_price', color='type').show()
 
 
 # This is a nice chart, but it’s only for one geography of ‘Los Angeles’.
@@ -85,10 +98,9 @@ px.line(df[msk], x='date', y='average_price', color='type')
 
 
 from dash import Dash, html, dcc, Input, Output
-import pandas as pd
-import plotly.express as px
 
-avocado = pd.read_csv('avocado-updated-2020.csv')
+# The dataset is already loading in the background (avocado_future, step #1),
+# so the layout can be served while the CSV is read
 
 
 # We’ll also create a Dash app object called app. This app is what we’ll be focusing on for the rest of the tutorial.
@@ -107,7 +119,7 @@ app = Dash()
 # - an H1 heading (html.H1) as the dashboard’s title. We specify its children property to be the text ‘Avocado Prices Dashboard’
 # - a dropdown menu (geo_dropdown, which is a dcc.Dropdown) based on the geography
 # We’ve built it as a variable outside and then referenced it within the layout:
-# – options: this property specifies the options of unique geographies the dropdown has
+# – options: this property specifies the options of unique geographies the dropdown has. The layout is served before the dataset has loaded, so it starts with just ‘New York’ (Dash clears a value that isn’t among the options) and a callback fills in the full list once the data is ready
 # – value: this property is the selected geography when we first launch the app. We made it as ‘New York’
 # - a graph (dcc.Graph) with id ‘price-graph’
 # Below is the code to set up the layout.
@@ -115,8 +127,7 @@ app = Dash()
 # In[8]:
 
 
-geo_dropdown = dcc.Dropdown(options=avocado['geography'].unique(),
-                            value='New York')
+geo_dropdown = dcc.Dropdown(options=['New York'], value='New York')
 
 app.layout = html.Div(children=[
     html.H1(children='Avocado Prices Dashboard'),
@@ -141,11 +152,22 @@ app.layout = html.Div(children=[
 # In[9]:
 
 
+@app.callback(
+    Output(component_id=geo_dropdown, component_property='options'),
+    Input(component_id=geo_dropdown, component_property='id')
+)
+def load_geographies(_):
+    # Runs once on page load; the options arrive when the data is ready
+    avocado = avocado_future.result()
+    return avocado['geography'].unique().tolist()
+
+
 @app.callback(
     Output(component_id='price-graph', component_property='figure'),
     Input(component_id=geo_dropdown, component_property='value')
 )
 def update_graph(selected_geography):
+    avocado = avocado_future.result()
     filtered_avocado = avocado[avocado['geography'] == selected_geography]
     line_fig = px.line(filtered_avocado,
                        x='date', y='average_price',
@@ -193,18 +215,15 @@ if __name__ == '__main__':
 
 # Import libraries
 from dash import Dash, html, dcc, Input, Output
-import pandas as pd
-import plotly.express as px
 
-# Load the dataset
-avocado = pd.read_csv('avocado-updated-2020.csv')
+# The dataset (avocado_future) and plotly (px) are the lazy, background-loaded
+# ones set up in step #1, so the CSV is only read once
 
 # Create the Dash app
 app = Dash()
 
 # Set up the app layout
-geo_dropdown = dcc.Dropdown(options=avocado['geography'].unique(),
-                            value='New York')
+geo_dropdown = dcc.Dropdown(options=['New York'], value='New York')
 
 app.layout = html.Div(children=[
     html.H1(children='Avocado Prices Dashboard'),
@@ -213,12 +232,23 @@ app.layout = html.Div(children=[
 ])
 
 
-# Set up the callback function
+# Set up the callback functions
+@app.callback(
+    Output(component_id=geo_dropdown, component_property='options'),
+    Input(component_id=geo_dropdown, component_property='id')
+)
+def load_geographies(_):
+    # Runs once on page load; the options arrive when the data is ready
+    avocado = avocado_future.result()
+    return avocado['geography'].unique().tolist()
+
+
 @app.callback(
     Output(component_id='price-graph', component_property='figure'),
     Input(component_id=geo_dropdown, component_property='value')
 )
 def update_graph(selected_geography):
+    avocado = avocado_future.result()
     filtered_avocado = avocado[avocado['geography'] == selected_geography]
     line_fig = px.line(filtered_avocado,
                        x='date', y='average_price',
@@ -2,59 +2,91 @@ import streamlit as st
 import pandas as pd
 import requests
 from io import StringIO
-import plotly.express as px
+from shared_data import load_shared, DATA_TTL
+from result_cache import result_cache, filter_key
+from startup import lazy_import, load_in_background, wait_for, LoadError
+
+# Plotly is only imported once the first chart is drawn
+px = lazy_import('plotly.express')
 
 # Load datasets with separate functions or identifiers
-@st.cache_data
-def load_top_movies():
+def fetch_top_movies():
     url = 'https://raw.githubusercontent.com/Agnieszka-Kamieniksba23169/Test_Uber_App/main/top_movies.csv'
     response = requests.get(url)
     if response.status_code == 200:
         return pd.read_csv(StringIO(response.text))
     else:
-        st.error("Failed to load top movies data.")
-        return None
+        raise LoadError("Failed to load top movies data.")
 
-@st.cache_data
-def load_user_frequency():
+def fetch_user_frequency():
     url = 'https://raw.githubusercontent.com/Agnieszka-Kamieniksba23169/Test_Uber_App/main/user_frequency.csv'
     response = requests.get(url)
     if response.status_code == 200:
         return pd.read_csv(StringIO(response.text))
     else:
-        st.error("Failed to load user frequency data.")
-        return None
+        raise LoadError("Failed to load user frequency data.")
 
-@st.cache_data
-def load_ratings():
+def fetch_ratings():
     url = 'https://raw.githubusercontent.com/Agnieszka-Kamieniksba23169/Test_Uber_App/main/processed_ratings.csv'
     response = requests.get(url)
     if response.status_code == 200:
-        return pd.read_csv(StringIO(response.text))
+        ratings = pd.read_csv(StringIO(response.text))
+        if 'hour' not in ratings.columns:
+            ratings['hour'] = pd.to_datetime(ratings['timestamp'], unit='s').dt.hour
+        return ratings
     else:
-        st.error("Failed to load ratings data.")
-        return None
+        raise LoadError("Failed to load ratings data.")
 
-# Load data
-top_movies = load_top_movies()
-user_freq = load_user_frequency()
-ratings = load_ratings()
+# Share one memory-mapped copy of each dataset across all sessions,
+# loaded in the background so the page shell renders first
+@st.cache_resource(ttl=DATA_TTL)
+def load_top_movies():
+    return load_in_background(load_shared, 'top_movies', fetch_top_movies)
 
-# Handle data loading issues
-if top_movies is None or user_freq is None or ratings is None:
-    st.stop()
+@st.cache_resource(ttl=DATA_TTL)
+def load_user_frequency():
+    return load_in_background(load_shared, 'user_frequency', fetch_user_frequency)
+
+@st.cache_resource(ttl=DATA_TTL)
+def load_ratings():
+    return load_in_background(load_shared, 'ratings', fetch_ratings)
 
 # Page Config
 st.set_page_config(page_title="Youth Movie Rating Dashboard", layout="wide")
 
+# Start loading data
+top_movies_future = load_top_movies()
+user_freq_future = load_user_frequency()
+ratings_future = load_ratings()
+
 st.title("Movie Ratings Dashboard for Young Adults (18–35)")
 st.markdown("Interactive dashboard to explore user behavior and ML potential from movie ratings.")
 
+loaded = []
+with st.spinner("Loading data..."):
+    for future, cached in [(top_movies_future, load_top_movies),
+                           (user_freq_future, load_user_frequency),
+                           (ratings_future, load_ratings)]:
+        try:
+            loaded.append(wait_for(future, cached))
+        except LoadError as error:
+            st.error(str(error))
+            loaded.append(None)
+top_movies, user_freq, ratings = loaded
+
+# Handle data loading issues
+if top_movies is None or user_freq is None or ratings is None:
+    st.stop()
+
 # Summary Cards
 col1, col2, col3 = st.columns(3)
 col1.metric("Total Ratings", f"{len(ratings):,}")
-col2.metric("Unique Users", f"{ratings['userId'].nunique():,}")
-col3.metric("Movies Rated", f"{ratings['movieId'].nunique():,}")
+version = ratings.attrs['version']
+unique_users, unique_movies = result_cache.get_or_compute(
+    version, 'unique_counts', filter_key(),
+    lambda: (ratings['userId'].nunique(), ratings['movieId'].nunique()))
+col2.metric("Unique Users", f"{unique_users:,}")
+col3.metric("Movies Rated", f"{unique_movies:,}")
 
 st.markdown("---")
 
@@ -67,11 +99,13 @@ st.plotly_chart(fig_top_movies, use_container_width=True)
 
 # Rating Activity Over Time
 st.subheader("Rating Activity Over Time")
-if 'hour' not in ratings.columns:
-    ratings['hour'] = pd.to_datetime(ratings['timestamp'], unit='s').dt.hour
-activity = ratings.groupby('hour')['rating'].count().reset_index()
-fig_activity = px.line(activity, x='hour', y='rating', markers=True,
-                       title="Ratings by Hour of Day", labels={'rating': 'Number of Ratings'})
+def activity_figure():
+    activity = ratings.groupby('hour')['rating'].count().reset_index()
+    return px.line(activity, x='hour', y='rating', markers=True,
+                   title="Ratings by Hour of Day", labels={'rating': 'Number of Ratings'}).to_dict()
+
+# Figure specs are cached as plain dicts; every session gets its own copy
+fig_activity = result_cache.get_or_compute(version, 'activity_figure', filter_key(), activity_figure)
 st.plotly_chart(fig_activity, use_container_width=True)
 
 # User Rating Frequency
@@ -82,11 +116,14 @@ st.plotly_chart(fig_users, use_container_width=True)
 
 # Heatmap of Ratings (Machine Learning Suitability)
 st.subheader("Ratings Heatmap (ML Suitability)")
-sample = ratings.sample(1000, random_state=42)
-pivot = sample.pivot_table(index='userId', columns='movieId', values='rating')
-fig_heatmap = px.imshow(pivot, color_continuous_scale='Viridis',
-                        labels=dict(color="Rating"),
-                        title="User-Movie Interaction Matrix (Sampled)")
+def heatmap_figure():
+    sample = ratings.sample(1000, random_state=42)
+    pivot = sample.pivot_table(index='userId', columns='movieId', values='rating')
+    return px.imshow(pivot, color_continuous_scale='Viridis',
+                     labels=dict(color="Rating"),
+                     title="User-Movie Interaction Matrix (Sampled)").to_dict()
+
+fig_heatmap = result_cache.get_or_compute(version, 'heatmap_figure', filter_key(), heatmap_figure)
 st.plotly_chart(fig_heatmap, use_container_width=True)
 
 # Footer
@@ -0,0 +1,154 @@
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+# Derived results (filtered row positions, aggregates, figure specs) shared by
+# every session in the process. Entries are keyed by dataset version plus the
+# normalized filter state and evicted least-recently-used once over budget.
+DEFAULT_MAX_BYTES = int(os.environ.get('RESULT_CACHE_BYTES', 256 * 1024 * 1024))
+
+
+def _normalize(value):
+    # Filter widgets hand back lists in selection order, tuples, numpy scalars, ...
+    # Map them onto one canonical form so equal filter states share an entry.
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize(v) for v in value), key=repr)
+    if isinstance(value, (list, tuple, np.ndarray, pd.Index)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, np.generic):
+        return _normalize(value.item())
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def filter_key(**filters):
+    """Canonical key for a filter state; multiselect values are order-insensitive."""
+    state = {}
+    for name, value in filters.items():
+        if isinstance(value, list):
+            value = set(value)
+        state[name] = _normalize(value)
+    raw = json.dumps(state, sort_keys=True, default=str)
+    # Hashed so a large selection (e.g. every user ID) doesn't bloat the key
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def sizeof(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+def _freeze(value):
+    # Cached arrays are shared between sessions as-is, so they are made read-only
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    return value
+
+
+def _copy_out(value):
+    # Mutable results are copied per caller so one session can't change another's view.
+    # pandas copy-on-write makes a shallow copy enough for frames, and it costs nothing.
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+class ResultCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, version, name, filters, compute):
+        """Return the cached result for (version, name, filters), computing it on a miss."""
+        key = (version, name, filters)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_out(self._entries[key][0])
+            pending = self._pending.get(key)
+            if pending is None:
+                self.misses += 1
+                pending = self._pending[key] = Future()
+                owner = True
+            else:
+                # Another session is already computing this key; wait for its result
+                self.hits += 1
+                owner = False
+
+        if not owner:
+            return _copy_out(pending.result())
+
+        # Computed outside the lock so one slow filter doesn't block other sessions
+        try:
+            value = _freeze(compute())
+        except BaseException as error:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(error)
+            raise
+
+        size = sizeof(value)
+        with self._lock:
+            del self._pending[key]
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (value, size)
+                self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+        pending.set_result(value)
+        return _copy_out(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# Module state survives Streamlit reruns, so every session in the process shares it
+result_cache = ResultCache()
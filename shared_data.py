@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Datasets are published once as one .npy file per column and then memory-mapped
+# read-only by every session and every app process. The OS page cache holds a
+# single copy, so each extra session only pays for the small DataFrame wrapper.
+#
+# The store is private to the current user: the directory name carries the uid and
+# it must be owned by that user with no group/other access before anything is trusted.
+_UID = os.getuid() if hasattr(os, 'getuid') else None
+_ROOT_NAME = 'dashboard_data' if _UID is None else f'dashboard_data-{_UID}'
+if os.path.isdir('/dev/shm'):
+    SHARED_ROOT = os.path.join('/dev/shm', _ROOT_NAME)
+else:
+    SHARED_ROOT = os.path.join(tempfile.gettempdir(), _ROOT_NAME)
+
+MANIFEST = 'manifest.json'
+
+# Apps re-run their loaders at most this often, so changes to the source data show up
+DATA_TTL = int(os.environ.get('SHARED_DATA_TTL', 60 * 60))
+
+
+def dataset_version(df):
+    # Content hash, so the version changes with the data, the column names or the dtypes
+    digest = hashlib.sha1()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _shared_root():
+    os.makedirs(SHARED_ROOT, mode=0o700, exist_ok=True)
+    info = os.lstat(SHARED_ROOT)
+    if _UID is not None and (not stat.S_ISDIR(info.st_mode) or info.st_uid != _UID
+                             or info.st_mode & 0o077):
+        raise PermissionError(f'{SHARED_ROOT} must be a directory owned by uid {_UID} '
+                              'with mode 0700')
+    return SHARED_ROOT
+
+
+# Nullable Int64/Float64/boolean columns: stored as their values plus a missing-value mask
+_MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+
+def _is_text(series):
+    # object, string or category columns whose values are all strings
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.cat.categories
+    elif pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype):
+        values = series
+    else:
+        return False
+    return pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty')
+
+
+def _dataset_dir(name, version):
+    return os.path.join(SHARED_ROOT, f'{name}-{version}')
+
+
+def publish(name, version, df):
+    """Write the columns of df to shared storage and return the dataset directory."""
+    _shared_root()
+    target = _dataset_dir(name, version)
+    if os.path.exists(os.path.join(target, MANIFEST)):
+        return target
+
+    staging = tempfile.mkdtemp(prefix=f'.{name}-', dir=_shared_root())
+    columns = []
+    for i, column in enumerate(df.columns):
+        series = df[column]
+        entry = {'name': str(column), 'file': f'{i}.npy'}
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            # Stored as naive UTC, the zone is restored on attach
+            values = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+            entry['kind'] = 'array'
+            entry['tz'] = str(series.dt.tz)
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+            values = series.to_numpy()
+            entry['kind'] = 'array'
+        elif isinstance(series.array, _MASKED_ARRAYS):
+            numpy_dtype = series.dtype.numpy_dtype
+            values = series.array.to_numpy(dtype=numpy_dtype, na_value=numpy_dtype.type(0))
+            entry['kind'] = 'masked'
+            entry['dtype'] = str(series.dtype)
+            entry['mask'] = f'{i}.mask.npy'
+            np.save(os.path.join(staging, entry['mask']), series.isna().to_numpy())
+        elif not _is_text(series):
+            # Mixed objects, intervals, ... can't be stored without pickle, so they
+            # stay a private column of the frame the loader returned
+            entry['kind'] = 'private'
+            del entry['file']
+            columns.append(entry)
+            continue
+        else:
+            # Strings cannot be mapped directly, so store them as integer codes
+            # plus a table of distinct values
+            categorical = pd.Categorical(series)
+            values = categorical.codes
+            entry['kind'] = 'category'
+            entry['categories'] = f'{i}.categories.npy'
+            # Saved as a fixed-width unicode array, so loading never unpickles anything
+            np.save(os.path.join(staging, entry['categories']),
+                    np.asarray(categorical.categories, dtype=str), allow_pickle=False)
+        np.save(os.path.join(staging, entry['file']), np.ascontiguousarray(values))
+        columns.append(entry)
+
+    with open(os.path.join(staging, MANIFEST), 'w') as f:
+        json.dump({'name': name, 'version': version, 'rows': len(df), 'columns': columns}, f)
+
+    try:
+        os.rename(staging, target)
+    except OSError:
+        # Another process published the same version first
+        shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+def prune(name, keep):
+    """Remove every published version of name except keep."""
+    if not os.path.isdir(SHARED_ROOT):
+        return
+    for entry in os.listdir(_shared_root()):
+        prefix, _, version = entry.rpartition('-')
+        if prefix == name and version != keep:
+            # Sessions still mapping the old files keep them until they let go
+            shutil.rmtree(os.path.join(SHARED_ROOT, entry), ignore_errors=True)
+
+
+def attach(name, version, df=None):
+    """Return a read-only DataFrame whose columns are views over the shared files.
+
+    Columns that could not be shared are taken from df, the frame the loader returned.
+    """
+    _shared_root()
+    path = _dataset_dir(name, version)
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+
+    data = {}
+    for entry in manifest['columns']:
+        if entry['kind'] == 'private':
+            if df is None:
+                raise ValueError(f"column {entry['name']!r} of {name!r} is not in the shared "
+                                 'store; pass the loaded frame to attach()')
+            data[entry['name']] = df[entry['name']]
+            continue
+        values = np.load(os.path.join(path, entry['file']), mmap_mode='r')
+        if entry['kind'] == 'masked':
+            mask = np.load(os.path.join(path, entry['mask']), mmap_mode='r')
+            array_type = pd.api.types.pandas_dtype(entry['dtype']).construct_array_type()
+            values = array_type(values, mask)
+        elif entry['kind'] == 'category':
+            categories = np.load(os.path.join(path, entry['categories']), allow_pickle=False)
+            values = pd.Categorical.from_codes(values, categories=categories)
+        elif entry.get('tz'):
+            values = pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(entry['tz'])
+        data[entry['name']] = values
+    frame = pd.DataFrame(data, copy=False)
+    # Lets derived-result caches key entries on the exact dataset they came from
+    frame.attrs['version'] = version
+    return frame
+
+
+def load_shared(name, loader, *args):
+    """Run loader(*args), publish the result if it is new, then attach to the shared copy.
+
+    Processes that load identical data share one copy; older versions of name
+    are removed. Returns None if the loader does.
+    """
+    df = loader(*args)
+    if df is None:
+        return None
+    version = dataset_version(df)
+    publish(name, version, df)
+    prune(name, version)
+    try:
+        return attach(name, version, df)
+    except FileNotFoundError:
+        # Another process published newer data and pruned this version in between
+        publish(name, version, df)
+        return attach(name, version, df)
+
+
+def session_overhead(name, version, sessions=20):
+    """Average private heap allocated per attached session, in bytes."""
+    attach(name, version)  # warm imports and the page cache
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    frames = [attach(name, version) for _ in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del frames
+    return (after - before) / sessions
+
+
+if __name__ == '__main__':
+    # Measure the per-session cost of the shared layer against a private copy.
+    # 'title' is high-cardinality text: its table of distinct values is rebuilt in
+    # private memory on every attach, so it dominates the shared figure.
+    rows = 1_000_000
+    rng = np.random.default_rng(42)
+    titles = np.array([f'Movie title number {i} (extended edition)' for i in range(50_000)])
+    sample = pd.DataFrame({
+        'userId': rng.integers(1, 10_000, rows),
+        'movieId': rng.integers(1, 5_000, rows),
+        'rating': rng.uniform(0.5, 5.0, rows),
+        'timestamp': pd.to_datetime(rng.integers(1e9, 1.6e9, rows), unit='s'),
+        'genres': rng.choice(['Action', 'Comedy', 'Drama', 'Horror'], rows),
+        'title': rng.choice(titles, rows),
+    })
+    version = dataset_version(sample)
+    publish('benchmark', version, sample)
+    try:
+        private = sample.memory_usage(deep=True).sum()
+        shared = session_overhead('benchmark', version)
+        print(f'Private copy per session: {private / 1e6:.1f} MB')
+        print(f'Shared view per session:  {shared / 1e6:.2f} MB')
+    finally:
+        # /dev/shm is RAM-backed; don't leave the benchmark data behind
+        prune('benchmark', None)
@@ -0,0 +1,168 @@
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Helpers that get the page shell out before the slow parts of a dashboard run:
+# plotting libraries are imported on first use and data is loaded on a worker
+# thread while the title and layout render.
+
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access."""
+
+    def __init__(self, name, on_load=None):
+        self._name = name
+        self._on_load = on_load
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                module = importlib.import_module(self._name)
+                if self._on_load is not None:
+                    self._on_load(module)
+                self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f'<lazy module {self._name!r} ({state})>'
+
+
+def lazy_import(name, on_load=None):
+    # on_load runs once after the real import, e.g. to apply a plotting style
+    return LazyModule(name, on_load)
+
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='data-loader')
+
+
+class LoadError(Exception):
+    """Raised by a loader whose data could not be fetched.
+
+    Loaders run on a worker thread, so they raise instead of calling st.error();
+    the script that waits for the result renders the message in its own session.
+    """
+
+
+def load_in_background(loader, *args):
+    """Start loader(*args) on a worker thread and return its Future."""
+    return _executor.submit(loader, *args)
+
+
+def wait_for(future, cached=None):
+    """Block until a background load finishes.
+
+    If the load raised, cached (the st.cache_resource function holding the
+    future) is cleared so the next rerun tries again instead of reusing the failure.
+    """
+    try:
+        return future.result()
+    except Exception:
+        if cached is not None:
+            cached.clear()
+        raise
+
+
+_REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs one dashboard script in a fresh interpreter and prints the seconds from
+# interpreter start until its first visible element: the first Streamlit element
+# call, or for Dash apps the moment app.layout is assigned.
+_FIRST_PAINT_PROBE = """
+import os, runpy, sys, time
+start = time.perf_counter()
+path = sys.argv[1]
+
+class FirstPaint(BaseException):
+    pass
+
+def paint(*args, **kwargs):
+    raise FirstPaint
+
+sys.path.insert(0, os.getcwd())
+with open(path, encoding='utf-8') as f:
+    source = f.read()
+if 'import streamlit' in source:
+    import streamlit as st
+    for name in ('title', 'header', 'subheader', 'markdown', 'text', 'write',
+                 'caption', 'error', 'dataframe', 'table'):
+        setattr(st, name, paint)
+else:
+    import dash
+    def __setattr__(self, name, value, _setattr=dash.Dash.__setattr__):
+        _setattr(self, name, value)
+        if name == 'layout':
+            raise FirstPaint
+    dash.Dash.__setattr__ = __setattr__
+
+try:
+    runpy.run_path(path, run_name='__main__')
+except FirstPaint:
+    print(time.perf_counter() - start, flush=True)
+    os._exit(0)  # don't wait for background loads still running
+sys.exit('script finished without drawing anything')
+"""
+
+
+def time_to_first_paint(path, repeat=3):
+    """Best-of-repeat seconds until path draws its first element, or an error string."""
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', _FIRST_PAINT_PROBE, path],
+                                capture_output=True, text=True, cwd=_REPO_DIR)
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            return lines[-1] if lines else f'exit code {result.returncode}'
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(times)
+
+
+def _baseline_copy(app, revision, directory):
+    # The app as it was at revision, written to a scratch file; None if it didn't exist
+    result = subprocess.run(['git', 'show', f'{revision}:{app}'], capture_output=True,
+                            cwd=_REPO_DIR)
+    if result.returncode != 0:
+        return None
+    path = os.path.join(directory, os.path.basename(app))
+    with open(path, 'wb') as f:
+        f.write(result.stdout)
+    return path
+
+
+if __name__ == '__main__':
+    # Time-to-first-paint profile of each dashboard against a baseline revision
+    # (the first commit by default). Usage: python startup.py [--baseline REV] [app.py ...]
+    args = sys.argv[1:]
+    if args[:1] == ['--baseline']:
+        revision, args = args[1], args[2:]
+    else:
+        revision = subprocess.run(['git', 'rev-list', '--max-parents=0', 'HEAD'],
+                                  capture_output=True, text=True,
+                                  cwd=_REPO_DIR).stdout.split()[0]
+    apps = args or ['uber_pickups.py', 'Dash.py', 'test.py', 'test test.py',
+                    'Avocado_dasboard.py']
+
+    fmt = lambda value: f'{value * 1000:.0f} ms' if isinstance(value, float) else 'n/a'
+    notes = []
+    print(f'{"app":<22}{"baseline " + revision[:7]:>18}{"now":>12}')
+    with tempfile.TemporaryDirectory() as scratch:
+        for app in apps:
+            baseline_path = _baseline_copy(app, revision, scratch)
+            before = time_to_first_paint(baseline_path) if baseline_path else 'not in baseline'
+            now = time_to_first_paint(os.path.join(_REPO_DIR, app))
+            print(f'{app:<22}{fmt(before):>18}{fmt(now):>12}')
+            for label, value in (('baseline', before), ('now', now)):
+                if not isinstance(value, float):
+                    notes.append(f'  {app} ({label}): {value}')
+    if notes:
+        print('\nNot measured:')
+        print('\n'.join(notes))
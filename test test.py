@@ -7,22 +7,24 @@
 import pandas as pd
 import numpy as np
 import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
+from startup import lazy_import, load_in_background
 
 
 # In[2]:
 
 
-# Set visual style
-sns.set(style="whitegrid")
+# Plotting libraries are only imported once the first chart is drawn.
+# The style is set when seaborn loads; loading pyplot loads seaborn too, so the
+# style is in place before any figure is created, whichever is used first.
+sns = lazy_import('seaborn', on_load=lambda sns: sns.set(style="whitegrid"))
+plt = lazy_import('matplotlib.pyplot', on_load=lambda plt: sns.set(style="whitegrid"))
 
 
 # In[3]:
 
 
-# Load the dataset
-movie_df = pd.read_csv("movie_df.csv")
+# Load the dataset in the background while the page shell renders
+movie_df_future = load_in_background(pd.read_csv, "movie_df.csv")
 
 
 # In[4]:
@@ -32,6 +34,8 @@ movie_df = pd.read_csv("movie_df.csv")
 st.title("🎬 Movie Insight Dashboard for Young Adults (18-35)")
 st.markdown("Explore movie ratings and patterns through engaging visuals")
 
+movie_df = movie_df_future.result()
+
 
 # In[5]:
 
@@ -3,28 +3,79 @@ import pandas as pd
 import numpy as np
 import requests
 from io import StringIO
-import matplotlib.pyplot as plt
-import seaborn as sns
+from shared_data import load_shared, DATA_TTL
+from result_cache import result_cache, filter_key
+from startup import lazy_import, load_in_background, wait_for, LoadError
 
-@st.cache_data
-def load_movie_df():
+# Plotting libraries are only imported once the first chart is drawn
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+
+def fetch_movie_df():
     url = 'https://raw.githubusercontent.com/Agnieszka-Kamieniksba23169/Test_Uber_App/refs/heads/main/movie_df.csv'
     response = requests.get(url)
     if response.status_code == 200:
         return pd.read_csv(StringIO(response.text))
     else:
-        st.error("Failed to load movies data.")
-        return None
+        raise LoadError("Failed to load movies data.")
+
+# One memory-mapped copy shared by every session instead of a pickled copy per rerun,
+# loaded in the background so the page shell renders first
+@st.cache_resource(ttl=DATA_TTL)
+def load_movie_df():
+    return load_in_background(load_shared, 'movie_df', fetch_movie_df)
+
+# Derived results, cached per dataset version and filter state across sessions
+def filter_rows(df, genre_filter, year_range, rating_threshold, user_filter):
+    # Apply filters as one mask so the shared frame is only copied once
+    mask = (
+        (df['year'] >= year_range[0]) &
+        (df['year'] <= year_range[1]) &
+        (df['rating'] >= rating_threshold)
+    )
+
+    if genre_filter:
+        mask &= df['genres'].isin(genre_filter)
+
+    if user_filter:
+        mask &= df['userId'].isin(user_filter)
+
+    return np.flatnonzero(mask)
+
+def top_rated(df):
+    return (
+        df.groupby(['movieId', 'title'], observed=True)
+        .agg(avg_rating=('rating', 'mean'), rating_count=('rating', 'count'))
+        .sort_values(by=['avg_rating', 'rating_count'], ascending=[False, False])
+        .head(10)
+        .reset_index()
+    )
+
+def ratings_over_time(df):
+    datetime = pd.to_datetime(dict(year=df.year, month=df.month, day=df.day))
+    return df['rating'].groupby(datetime.rename('datetime')).mean().reset_index()
+
+def genre_popularity(df):
+    genre_counts = df['genres'].astype(object).value_counts().head(10).reset_index()
+    genre_counts.columns = ['genre', 'count']
+    return genre_counts
 
-# Load data
-movie_df = load_movie_df()
+# Start loading data
+movie_df_future = load_movie_df()
+
+st.title("🎬 Movie Insight Dashboard for Young Adults (18-35)")
+st.markdown("Explore movie ratings and patterns through engaging visuals")
+
+with st.spinner("Loading data..."):
+    try:
+        movie_df = wait_for(movie_df_future, load_movie_df)
+    except LoadError as error:
+        st.error(str(error))
+        movie_df = None
 
 # Basic checks
 if movie_df is not None:
 
-    st.title("🎬 Movie Insight Dashboard for Young Adults (18-35)")
-    st.markdown("Explore movie ratings and patterns through engaging visuals")
-
     # Sidebar filters
     genre_filter = st.sidebar.multiselect(
         "Filter by Genre",
@@ -50,19 +101,18 @@ if movie_df is not None:
     )
 
     # Apply filters
-    filtered_df = movie_df.copy()
-
-    if genre_filter:
-        filtered_df = filtered_df[filtered_df['genres'].isin(genre_filter)]
-
-    filtered_df = filtered_df[
-        (filtered_df['year'] >= year_range[0]) & 
-        (filtered_df['year'] <= year_range[1])
-    ]
-    filtered_df = filtered_df[filtered_df['rating'] >= rating_threshold]
-
-    if user_filter:
-        filtered_df = filtered_df[filtered_df['userId'].isin(user_filter)]
+    version = movie_df.attrs['version']
+    filters = filter_key(
+        genres=genre_filter,
+        years=year_range,
+        min_rating=rating_threshold,
+        users=user_filter
+    )
+    rows = result_cache.get_or_compute(
+        version, 'rows', filters,
+        lambda: filter_rows(movie_df, genre_filter, year_range, rating_threshold, user_filter)
+    )
+    filtered_df = movie_df.iloc[rows]
 
     # Display filtered data summary
     st.subheader("Filtered Data Overview")
@@ -70,12 +120,8 @@ if movie_df is not None:
 
     # Most Popular Movies
     st.subheader("🎞️ Top Rated Movies")
-    top_movies = (
-        filtered_df.groupby(['movieId', 'title'])
-        .agg(avg_rating=('rating', 'mean'), rating_count=('rating', 'count'))
-        .sort_values(by=['avg_rating', 'rating_count'], ascending=[False, False])
-        .head(10)
-        .reset_index()
+    top_movies = result_cache.get_or_compute(
+        version, 'top_movies', filters, lambda: top_rated(filtered_df)
     )
     st.table(top_movies)
 
@@ -90,8 +136,9 @@ if movie_df is not None:
 
     # Ratings over time
     st.subheader("📅 Ratings Over Time")
-    filtered_df['datetime'] = pd.to_datetime(dict(year=filtered_df.year, month=filtered_df.month, day=filtered_df.day))
-    rating_over_time = filtered_df.groupby('datetime')['rating'].mean().reset_index()
+    rating_over_time = result_cache.get_or_compute(
+        version, 'rating_over_time', filters, lambda: ratings_over_time(filtered_df)
+    )
     fig2, ax2 = plt.subplots()
     sns.lineplot(data=rating_over_time, x='datetime', y='rating', ax=ax2)
     ax2.set_title("Average Rating Over Time")
@@ -101,8 +148,9 @@ if movie_df is not None:
 
     # Genre popularity
     st.subheader("🎭 Genre Popularity")
-    genre_counts = filtered_df['genres'].value_counts().head(10).reset_index()
-    genre_counts.columns = ['genre', 'count']
+    genre_counts = result_cache.get_or_compute(
+        version, 'genre_counts', filters, lambda: genre_popularity(filtered_df)
+    )
     fig3, ax3 = plt.subplots()
     sns.barplot(data=genre_counts, x='genre', y='count', ax=ax3)
     ax3.set_title("Most Watched Genres")
@@ -111,6 +159,10 @@ if movie_df is not None:
     ax3.tick_params(axis='x', rotation=45)
     st.pyplot(fig3)
 
+    # Shared result cache counters, including the lookups made on this run
+    with st.sidebar.expander("Cache stats"):
+        st.json(result_cache.stats())
+
     st.markdown("---")
     st.caption("Dashboard for Movie Analysis | Targeting Viewers aged 18-35")
 
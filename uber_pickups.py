@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-
-st.title("Uber Pickups in NYC")
+from shared_data import load_shared, DATA_TTL
+from result_cache import result_cache, filter_key
+from startup import load_in_background, wait_for
 
 DATE_COLUMN="date/time"
 
@@ -13,8 +14,6 @@ DATA_URL = ('https://s3-us-west-2.amazonaws.com/'
 
  
 
-@st.cache_data
-
 def load_data(nrows):
 
     data = pd.read_csv(DATA_URL, nrows=nrows)
@@ -29,22 +28,42 @@ def load_data(nrows):
 
  
 
+# One memory-mapped copy shared by every session instead of a pickled copy per rerun,
+# loaded in the background so the page shell renders first
+@st.cache_resource(ttl=DATA_TTL)
+def load_shared_data(nrows):
+    return load_in_background(load_shared, 'uber', load_data, nrows)
+
+ 
+
+# Start the download before anything is drawn so it overlaps with the page shell
+data_future = load_shared_data(10000)
+
+st.title("Uber Pickups in NYC")
+
 data_load_state = st.text('Loading data...')
-data = load_data(10000)
-data_load_state.text("Done! (using st.cache_data)")
+data = wait_for(data_future, load_shared_data)
+data_load_state.text("Done! (using shared memory)")
 
 if st.checkbox('Show raw data'):
     st.subheader('Raw data')
     st.write(data)
 
 st.subheader('Number of pickups by hour')
-hist_values = np.histogram(data[DATE_COLUMN].dt.hour, bins=24, range=(0,24))[0]
+version = data.attrs['version']
+hist_values = result_cache.get_or_compute(
+    version, 'hour_histogram', filter_key(),
+    lambda: np.histogram(data[DATE_COLUMN].dt.hour, bins=24, range=(0,24))[0])
 st.bar_chart(hist_values)
 
 
 # Some number in the range 0-23
 hour_to_filter = st.slider('hour', 0, 23, 17)
-filtered_data = data[data[DATE_COLUMN].dt.hour == hour_to_filter]
+# Row positions per hour are shared by every session that picks the same hour
+rows = result_cache.get_or_compute(
+    version, 'hour_rows', filter_key(hour=hour_to_filter),
+    lambda: np.flatnonzero(data[DATE_COLUMN].dt.hour == hour_to_filter))
+filtered_data = data.iloc[rows]
 
 
 st.subheader('Map of all pickups at %s:00' % hour_to_filter)